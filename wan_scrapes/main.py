@@ -1,14 +1,26 @@
 import os
 import re
-import json
+import signal
+import argparse
+import orjson
+import sqlite3
+import asyncio
 import logging
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+import multiprocessing
+import aiohttp
+from multidict import CIMultiDict
+import lxml.html
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser
+from contextlib import asynccontextmanager, closing, suppress
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from colorama import init, Fore, Style
 import pyfiglet
 from urllib.parse import urlparse, urljoin
-from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
 import time
 
@@ -26,9 +38,13 @@ logging.basicConfig(
     ]
 )
 
+@lru_cache(maxsize=1)
+def banner_text() -> str:
+    # figlet loads and parses the font file on every call; render it once.
+    return Fore.MAGENTA + pyfiglet.figlet_format("Wan Scraps", font="slant") + Style.RESET_ALL
+
 def banner():
-    ascii_banner = pyfiglet.figlet_format("Wan Scraps", font="slant")
-    print(Fore.MAGENTA + ascii_banner + Style.RESET_ALL)
+    print(banner_text())
 
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
 if not DISCORD_WEBHOOK_URL:
@@ -37,156 +53,438 @@ if not DISCORD_WEBHOOK_URL:
 
 HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
 
-session = requests.Session()
-retries = Retry(
-    total=5,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["HEAD", "GET", "OPTIONS"]
+MAX_CONCURRENT_FETCHES = 20
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=10)
+MAX_RESPONSE_BYTES = int(os.getenv("MAX_RESPONSE_BYTES", 2 * 1024 * 1024))
+READ_CHUNK_SIZE = 64 * 1024
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DNS_CACHE_TTL = 900
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 10
+KEEPALIVE_TIMEOUT = 75
+
+MAX_CONCURRENT_WEBHOOKS = 5
+WEBHOOK_TIMEOUT = aiohttp.ClientTimeout(total=10)
+WEBHOOK_RETRIES = 3
+WEBHOOK_RATE = 30  # posts per WEBHOOK_RATE_PERIOD, Discord's per-webhook limit
+WEBHOOK_RATE_PERIOD = 60
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+EMBED_BATCH_LINGER = 2.0
+
+CACHE_PATH = "wan_cache.sqlite"
+HEAD_ONLY = os.getenv("HEAD_ONLY", "").lower() in ("1", "true", "yes")
+
+PIPELINE_QUEUE_SIZE = 32
+PARSE_WORKERS = os.cpu_count() or 4
+# The parent is multi-threaded by the time the pool starts (c-ares resolver, cache writer),
+# so workers must not be forked from it; forkserver children come from a clean process.
+PARSE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
 )
-adapter = HTTPAdapter(max_retries=retries)
-session.mount("https://", adapter)
-session.mount("http://", adapter)
 
 def is_valid_url(url: str) -> bool:
-    parsed = urlparse(url)
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        # e.g. an unbalanced IPv6 bracket such as "http://[::1/"
+        return False
     return parsed.scheme in ('http', 'https') and parsed.netloc != ''
 
+MARKDOWN_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in r'\*_`~|>'})
+
 def escape_markdown(text: str) -> str:
-    escape_chars = r'\*_`~|>'
-    return re.sub(f"([{re.escape(escape_chars)}])", r"\\\1", text)
+    return text.translate(MARKDOWN_ESCAPE_TABLE)
 
 def safe_truncate(text: str, max_len=700) -> str:
     if len(text) > max_len:
         return text[:max_len] + "…"
     return text
 
-def fetch_website_content(url: str):
+class ResponseCache:
+    """Page bodies keyed by URL, revalidated with If-None-Match / If-Modified-Since."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        # WAL lets lookups on the event loop read while the writer thread commits.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(url TEXT PRIMARY KEY, status INTEGER, headers TEXT, body TEXT)"
+        )
+        # Writes commit up to MAX_RESPONSE_BYTES per page, so they run on one background
+        # thread with its own connection instead of stalling every fetcher on the loop.
+        self.writer = ThreadPoolExecutor(max_workers=1, initializer=self._open_writer, initargs=(path,))
+
+    def _open_writer(self, path: str):
+        self.write_conn = sqlite3.connect(path)
+
+    def get(self, url: str):
+        row = self.conn.execute(
+            "SELECT status, headers, body FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        status, headers, body = row
+        return status, CIMultiDict(orjson.loads(headers)), body
+
+    def put(self, url: str, status: int, headers, body: str):
+        write = self.writer.submit(self._write, url, status, headers.copy(), body)
+        write.add_done_callback(self._log_write_error)
+
+    def _write(self, url: str, status: int, headers, body: str):
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            # Without a validator the server can never answer 304; drop any stale entry so
+            # later runs stop revalidating against validators the page no longer sends.
+            self.write_conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+        else:
+            self.write_conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (url, status, orjson.dumps(list(headers.items())).decode(), body),
+            )
+        self.write_conn.commit()
+
+    @staticmethod
+    def _log_write_error(write):
+        if write.exception():
+            logging.warning(f"Failed to update the response cache: {write.exception()!r}")
+
+    def close(self):
+        # Flushes pending writes before the connections go away.
+        self.writer.submit(lambda: self.write_conn.close())
+        self.writer.shutdown()
+        self.conn.close()
+
+def conditional_headers(cached) -> dict:
+    # HEADERS are session defaults; only the revalidation headers vary per request.
+    headers = {}
+    if cached:
+        _, cached_headers, _ = cached
+        if "ETag" in cached_headers:
+            headers["If-None-Match"] = cached_headers["ETag"]
+        if "Last-Modified" in cached_headers:
+            headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+    return headers
+
+async def read_body(response, url: str) -> str:
+    # Stream the body and stop at MAX_RESPONSE_BYTES; everything we extract sits near the top.
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+        body += chunk
+        if len(body) >= MAX_RESPONSE_BYTES:
+            logging.warning(f"Truncated {url} at {MAX_RESPONSE_BYTES} bytes")
+            del body[MAX_RESPONSE_BYTES:]
+            break
+    try:
+        return body.decode(response.charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+def retry_after_seconds(headers):
+    # Retry-After is either delta-seconds or an HTTP-date; None when absent or unparsable.
+    value = headers.get("Retry-After")
+    if not value:
+        return None
     try:
-        start = time.time()
-        response = session.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        load_time = time.time() - start
-        logging.info(f"[✓] Fetched {url} (Status: {response.status_code}, Load Time: {load_time:.2f}s)")
-        return response.text, response.status_code, response.headers, load_time
-    except requests.RequestException as e:
-        status_code = getattr(e.response, 'status_code', 'N/A')
-        logging.error(f"[✗] Failed to fetch {url} (Status: {status_code}) - {e}")
-        return None, status_code, {}, 0
-
-def extract_json_ld(soup):
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+async def fetch_async(session, url: str, sem, cache=None):
+    start = time.time()
+    cached = cache.get(url) if cache else None
+    request_headers = conditional_headers(cached)
+    for attempt in range(RETRY_TOTAL + 1):
+        status_code = 'N/A'
+        delay = RETRY_BACKOFF_FACTOR * 2 ** attempt
+        try:
+            async with sem, session.get(url, headers=request_headers, timeout=FETCH_TIMEOUT) as response:
+                status_code = response.status
+                if status_code == 304 and cached:
+                    cached_status, cached_headers, html = cached
+                    load_time = time.time() - start
+                    logging.info(f"[✓] Not modified {url}, using cached body (Load Time: {load_time:.2f}s)")
+                    return html, cached_status, cached_headers, load_time
+                if status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                    response.raise_for_status()
+                    html = await read_body(response, url)
+                    load_time = time.time() - start
+                    logging.info(f"[✓] Fetched {url} (Status: {status_code}, Load Time: {load_time:.2f}s)")
+                    if cache:
+                        cache.put(url, status_code, response.headers, html)
+                    return html, status_code, response.headers.copy(), load_time
+                retry_after = retry_after_seconds(response.headers)
+                if retry_after is not None:
+                    delay = retry_after
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Client errors (4xx) are final; connection problems get retried like 5xx.
+            if isinstance(e, aiohttp.ClientResponseError) or attempt == RETRY_TOTAL:
+                logging.error(f"[✗] Failed to fetch {url} (Status: {status_code}) - {e!r}")
+                return None, status_code, {}, 0
+        # Back off outside the semaphore so a throttled host doesn't hold fetch slots.
+        await asyncio.sleep(delay)
+
+# Tags read for their attributes are collected as attribute dicts, the rest as text.
+ATTR_TAGS = ["html", "meta", "link", "a", "img"]
+TEXT_TAGS = ["title", "h1", "h2", "p"]
+COLLECTED_SELECTOR = ", ".join(ATTR_TAGS + TEXT_TAGS + ['script[type="application/ld+json"]'])
+
+def empty_buckets() -> dict:
+    return {name: [] for name in ATTR_TAGS + TEXT_TAGS + ["json_ld"]}
+
+def collect_tags_selectolax(html: str) -> dict:
+    # One document-order CSS pass over the lexbor tree, bucketed by tag name.
+    buckets = empty_buckets()
+    for node in LexborHTMLParser(html).css(COLLECTED_SELECTOR):
+        name = node.tag
+        if name == "script":
+            buckets["json_ld"].append(node.text())
+        elif name == "title":
+            buckets["title"].append(node.text())
+        elif name in TEXT_TAGS:
+            buckets[name].append(node.text(strip=True))
+        else:
+            buckets[name].append({k: v or "" for k, v in node.attributes.items()})
+    return buckets
+
+# Compiled once; a union path returns matches in document order, like the CSS pass above.
+LXML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+COLLECTED_XPATH = etree.XPath(
+    " | ".join(f"//{name}" for name in ATTR_TAGS + TEXT_TAGS) + ' | //script[@type="application/ld+json"]'
+)
+
+def collect_tags_lxml(html: str) -> dict:
+    buckets = empty_buckets()
+    try:
+        root = lxml.html.document_fromstring(html.encode("utf-8"), parser=LXML_PARSER)
+    except etree.ParserError:
+        return buckets
+    for el in COLLECTED_XPATH(root):
+        name = el.tag
+        if name == "script":
+            buckets["json_ld"].append(el.text or "")
+        elif name == "title":
+            buckets["title"].append(el.text_content())
+        elif name in TEXT_TAGS:
+            buckets[name].append("".join(text.strip() for text in el.itertext()))
+        else:
+            buckets[name].append(dict(el.attrib))
+    return buckets
+
+def collect_tags(html: str) -> dict:
+    try:
+        return collect_tags_selectolax(html)
+    except Exception as e:
+        logging.warning(f"selectolax failed to parse page, falling back to lxml: {e!r}")
+        return collect_tags_lxml(html)
+
+def find_meta(metas, attr, value):
+    for tag in metas:
+        if tag.get(attr) == value:
+            return tag
+    return None
+
+def extract_json_ld(scripts):
     data = []
-    for script in soup.find_all("script", type="application/ld+json"):
+    for script in scripts:
         try:
-            d = json.loads(script.string)
+            d = orjson.loads(script)
             data.append(d)
         except Exception:
             continue
     return data if data else ["Not found"]
 
-def extract_open_graph(soup):
+SOCIAL_META_PREFIXES = ("og:", "twitter:")
+
+def extract_open_graph(metas):
     og = {}
-    for tag in soup.find_all("meta"):
+    for tag in metas:
         prop = tag.get("property") or tag.get("name") or ""
-        if prop.startswith("og:") or prop.startswith("twitter:"):
+        if prop.startswith(SOCIAL_META_PREFIXES):
             og[prop] = tag.get("content", "Not found")
     return og if og else {"None": "Not found"}
 
-def find_favicons(soup, base_url):
+URL_SCHEME = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*:")
+# Hrefs urljoin would rewrite beyond simple concatenation: query/fragment/params, dot
+# segments, doubled slashes, empty hosts, backslashes and control/space characters.
+# These take the slow path.
+URL_JOIN_SLOW_PATH = re.compile(
+    r"[?#;\\\[\]\x00-\x20]|(?:^|/)\.\.?(?:/|$)|(?!^)(?<!^http:)(?<!^https:)//|^(?:https?:)?//(?:/|$)"
+)
+
+@lru_cache(maxsize=64)
+def url_resolver(base_url: str):
+    """Return a function equivalent to urljoin(base_url, href), with string fast paths.
+
+    Hrefs urljoin rejects (e.g. a malformed IPv6 host) resolve to None.
+    """
+    parsed = urlparse(base_url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    directory = urljoin(base_url, ".")
+
+    def join(href: str):
+        try:
+            return urljoin(base_url, href)
+        except ValueError:
+            return None
+
+    def resolve(href: str):
+        if not href or URL_JOIN_SLOW_PATH.search(href):
+            return join(href)
+        if not href.isascii() and href.startswith(("http://", "https://", "//")):
+            # urljoin rejects hosts that NFKC-normalise into URL delimiters; keep its verdict.
+            return join(href)
+        if href.startswith(("http://", "https://")):
+            return href
+        if href.startswith("//"):
+            return f"{parsed.scheme}:{href}"
+        if href.startswith("/"):
+            return origin + href
+        if URL_SCHEME.match(href):
+            return join(href)
+        return directory + href
+
+    return resolve
+
+def find_favicons(links, base_url):
+    resolve = url_resolver(base_url)
     icons = []
-    for link in soup.find_all("link", rel=lambda x: x and "icon" in x.lower()):
+    for link in links:
+        if "icon" not in link.get("rel", "").lower():
+            continue
         href = link.get("href")
-        if href:
-            icons.append(urljoin(base_url, href))
+        if href and (icon := resolve(href)):
+            icons.append(icon)
     return icons if icons else ["Not found"]
 
-def get_main_images(soup, base_url, max_images=5):
+def get_main_images(imgs, base_url, max_images=5):
+    resolve = url_resolver(base_url)
     images = []
-    for img in soup.find_all("img", src=True):
+    for img in imgs:
         src = img.get("src")
-        if src:
-            images.append(urljoin(base_url, src))
+        if src and (image := resolve(src)):
+            images.append(image)
         if len(images) >= max_images:
             break
     return images if images else ["Not found"]
 
-def get_canonical_url(soup, base_url):
-    link = soup.find("link", rel="canonical")
-    if link and link.get("href"):
-        return urljoin(base_url, link.get("href"))
+def get_canonical_url(links, base_url):
+    for link in links:
+        if "canonical" in link.get("rel", "").split():
+            if (href := link.get("href")) and (canonical := url_resolver(base_url)(href)):
+                return canonical
+            break
     return "Not found"
 
-def get_robots_meta(soup):
-    tag = soup.find("meta", attrs={"name": "robots"})
-    if tag and tag.get("content"):
-        return tag.get("content").strip()
+def get_robots_meta(metas):
+    tag = find_meta(metas, "name", "robots")
+    if tag and (content := tag.get("content")):
+        return content.strip()
     return "Not found"
 
-def count_links(soup, base_url):
+# Host of an absolute http(s) URL, read off the resolved full_url.
+LINK_NETLOC = re.compile(r"https?://([^/?#]*)", re.IGNORECASE)
+
+def count_links(anchors, base_url):
     internal = set()
     external = set()
-    parsed_base = urlparse(base_url)
-    base_domain = parsed_base.netloc.lower()
-    for a in soup.find_all("a", href=True):
-        href = a.get("href").strip()
+    base_domain = urlparse(base_url).netloc.lower()
+    resolve = url_resolver(base_url)
+    for a in anchors:
+        href = a.get("href")
+        if href is None:
+            continue
+        href = href.strip()
         if href.startswith("#") or href.lower().startswith("javascript:"):
             continue
-        full_url = urljoin(base_url, href)
-        parsed_url = urlparse(full_url)
-        domain = parsed_url.netloc.lower()
+        full_url = resolve(href)
+        if full_url is None:
+            continue
+        netloc = LINK_NETLOC.match(full_url)
+        if netloc:
+            domain = netloc.group(1).lower()
+        else:
+            # mailto:, tel:, ftp:// and friends are rare enough to parse properly.
+            domain = urlparse(full_url).netloc.lower()
         if domain == base_domain:
             internal.add(full_url)
         else:
             external.add(full_url)
     return list(internal), list(external)
 
-def smart_scrape(html: str, base_url: str, response_headers: dict, load_time: float) -> dict:
-    soup = BeautifulSoup(html, 'html.parser')
-
-    title = soup.title.string.strip() if soup.title and soup.title.string else "Title not found"
-
-    meta_desc_tag = soup.find("meta", attrs={"name": "description"})
+HEAD_END = re.compile(r"</head\s*>", re.IGNORECASE)
+
+HEAD_ONLY_SKIPPED = {
+    "headlines": ["Skipped (head-only mode)"],
+    "subheadlines": ["Skipped (head-only mode)"],
+    "summaries": ["Skipped (head-only mode)"],
+    "main_images": ["Skipped (head-only mode)"],
+    "internal_links_count": "Skipped (head-only mode)",
+    "external_links_count": "Skipped (head-only mode)",
+    "internal_links_sample": ["Skipped (head-only mode)"],
+    "external_links_sample": ["Skipped (head-only mode)"],
+}
+
+def head_section(html: str) -> str:
+    match = HEAD_END.search(html)
+    return html[:match.end()] if match else html
+
+def smart_scrape(html: str, base_url: str, response_headers: dict, load_time: float,
+                 head_only: bool = False) -> dict:
+    # Title, meta, link, JSON-LD and lang all live in <head>; the body is only needed for
+    # headlines, paragraphs, images and links, so head-only mode parses a much smaller DOM.
+    if head_only:
+        html = head_section(html)
+    tags = collect_tags(html)
+    metas = tags["meta"]
+
+    title = title_text.strip() if tags["title"] and (title_text := tags["title"][0]) else "Title not found"
+
+    meta_desc_tag = find_meta(metas, "name", "description")
     meta_desc = meta_desc_tag.get("content", "").strip() if meta_desc_tag else "Meta description not found"
 
-    meta_keywords_tag = soup.find("meta", attrs={"name": "keywords"})
+    meta_keywords_tag = find_meta(metas, "name", "keywords")
     meta_keywords = meta_keywords_tag.get("content", "").strip() if meta_keywords_tag else "Meta keywords not found"
 
-    h1_tags = [h1.get_text(strip=True) for h1 in soup.find_all("h1") if h1.get_text(strip=True)]
+    h1_tags = [h1 for h1 in tags["h1"] if h1]
     headlines = h1_tags[:5] or ["No H1 tags found"]
 
-    h2_tags = [h2.get_text(strip=True) for h2 in soup.find_all("h2") if h2.get_text(strip=True)]
+    h2_tags = [h2 for h2 in tags["h2"] if h2]
     subheadlines = h2_tags[:5] or ["No H2 tags found"]
 
-    paragraphs = [
-        p.get_text(strip=True) for p in soup.find_all("p")
-        if p.get_text(strip=True) and len(p.get_text(strip=True)) > 50
-    ]
+    paragraphs = [p for p in tags["p"] if len(p) > 50]
     summaries = paragraphs[:5] or ["No meaningful paragraphs found"]
 
     charset = None
-    charset_tag = soup.find("meta", charset=True)
+    charset_tag = next((tag for tag in metas if "charset" in tag), None)
     if charset_tag:
         charset = charset_tag.get("charset", None)
     else:
-        content_type = soup.find("meta", attrs={"http-equiv": "Content-Type"})
-        if content_type and "charset=" in content_type.get("content", ""):
-            charset = content_type.get("content").split("charset=")[-1]
+        content_type = find_meta(metas, "http-equiv", "Content-Type")
+        if content_type and "charset=" in (content := content_type.get("content", "")):
+            charset = content.split("charset=")[-1]
 
-    lang = soup.html.attrs.get("lang") if soup.html else None
+    lang = tags["html"][0].get("lang") if tags["html"] else None
 
-    json_ld = extract_json_ld(soup)
-    og_tags = extract_open_graph(soup)
-    favicons = find_favicons(soup, base_url)
-    main_images = get_main_images(soup, base_url)
-    canonical_url = get_canonical_url(soup, base_url)
-    robots_meta = get_robots_meta(soup)
-    internal_links, external_links = count_links(soup, base_url)
+    json_ld = extract_json_ld(tags["json_ld"])
+    og_tags = extract_open_graph(metas)
+    favicons = find_favicons(tags["link"], base_url)
+    main_images = get_main_images(tags["img"], base_url)
+    canonical_url = get_canonical_url(tags["link"], base_url)
+    robots_meta = get_robots_meta(metas)
+    internal_links, external_links = count_links(tags["a"], base_url)
 
     last_modified = response_headers.get("Last-Modified", "Not found")
     content_length = response_headers.get("Content-Length", "Unknown")
     server = response_headers.get("Server", "Unknown")
 
-    return {
+    scraped_data = {
         "title": title,
         "meta_description": meta_desc,
         "meta_keywords": meta_keywords,
@@ -210,18 +508,42 @@ def smart_scrape(html: str, base_url: str, response_headers: dict, load_time: fl
         "server": server,
         "load_time": load_time,
     }
+    if head_only:
+        scraped_data.update(HEAD_ONLY_SKIPPED)
+    return scraped_data
 
 def format_json_ld(json_ld_data):
     try:
         if isinstance(json_ld_data, list):
-            pretty = "\n".join(json.dumps(item, indent=2) if isinstance(item, dict) else str(item) for item in json_ld_data[:2])
+            pretty = "\n".join(orjson.dumps(item, option=orjson.OPT_INDENT_2).decode() if isinstance(item, dict) else str(item) for item in json_ld_data[:2])
         else:
-            pretty = json.dumps(json_ld_data, indent=2)
+            pretty = orjson.dumps(json_ld_data, option=orjson.OPT_INDENT_2).decode()
         return safe_truncate(pretty, 700)
     except Exception:
         return "Error formatting JSON-LD"
 
-def send_discord_embed(webhook_url, domain, scraped_data, url, status_code):
+class TokenBucket:
+    """Async token bucket allowing `rate` acquisitions per `period` seconds."""
+
+    def __init__(self, rate: int, period: float):
+        self.capacity = rate
+        self.tokens = rate
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+
+def build_embed(domain, scraped_data, url, status_code) -> dict:
     status_text = f"{status_code} OK" if status_code == 200 else f"Error: {status_code}"
     color = 0x2ecc71 if status_code == 200 else 0xe74c3c
 
@@ -269,6 +591,11 @@ def send_discord_embed(webhook_url, domain, scraped_data, url, status_code):
         {"name": f"JSON-LD Structured Data (first 2 blocks)", "value": format_json_ld(scraped_data['json_ld']), "inline": False},
     ]
 
+    # Discord rejects the whole message if any field value is empty or whitespace-only.
+    for field in fields:
+        if not field["value"].strip():
+            field["value"] = "None"
+
     embed = {
         "title": f"Wan Scraps: {domain}",
         "url": url,
@@ -280,18 +607,51 @@ def send_discord_embed(webhook_url, domain, scraped_data, url, status_code):
         }
     }
 
+    return embed
+
+def embed_chars(embed) -> int:
+    # Discord caps the combined length of these parts across all embeds in one message.
+    return (
+        len(embed["title"])
+        + len(embed["footer"]["text"])
+        + sum(len(field["name"]) + len(field["value"]) for field in embed["fields"])
+    )
+
+async def post_embeds(session, sem, limiter, webhook_url, embeds, domains):
+    label = ", ".join(domains)
     payload = {
         "username": "Wan Scraps Bot",
         "avatar_url": "https://www.python.org/static/favicon.ico",
-        "embeds": [embed]
+        "embeds": embeds
     }
 
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        response.raise_for_status()
-        logging.info(f"[✔] Sent embed to Discord for {domain} ({status_text})")
-    except requests.RequestException as e:
-        logging.error(f"[✘] Failed to send webhook for {domain}: {e}")
+        async with sem:
+            for attempt in range(WEBHOOK_RETRIES + 1):
+                await limiter.acquire()
+                async with session.post(webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT) as response:
+                    if response.status == 429 and attempt < WEBHOOK_RETRIES:
+                        retry_after = retry_after_seconds(response.headers)
+                        if retry_after is None:
+                            retry_after = 1
+                        logging.warning(f"Discord rate limit hit for {label}, retrying in {retry_after:.2f}s")
+                        await asyncio.sleep(retry_after)
+                        continue
+                    response.raise_for_status()
+                    break
+        logging.info(f"[✔] Sent {len(embeds)} embed(s) to Discord for {label}")
+    except aiohttp.ClientResponseError as e:
+        if e.status == 400 and len(embeds) > 1:
+            # One bad embed fails the whole message; retry one per message so the rest still land.
+            logging.warning(f"Discord rejected the batch for {label}, sending embeds individually: {e!r}")
+            await asyncio.gather(*[
+                post_embeds(session, sem, limiter, webhook_url, [embed], [domain])
+                for embed, domain in zip(embeds, domains)
+            ])
+        else:
+            logging.error(f"[✘] Failed to send webhook for {label}: {e!r}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.error(f"[✘] Failed to send webhook for {label}: {e!r}")
 
 def get_urls_from_input():
     print(Fore.YELLOW + "Enter website URLs to scrape (separate multiple URLs with commas):")
@@ -299,19 +659,251 @@ def get_urls_from_input():
     urls = [url.strip() for url in user_input.split(",") if url.strip()]
     return urls
 
+def failed_scrape_data() -> dict:
+    return {
+        "title": "N/A",
+        "meta_description": "N/A",
+        "meta_keywords": "N/A",
+        "headlines": ["Failed to retrieve content."],
+        "subheadlines": ["Failed to retrieve content."],
+        "summaries": ["Failed to retrieve content."],
+        "charset": "N/A",
+        "lang": "N/A",
+        "json_ld": ["N/A"],
+        "open_graph": {"N/A": "N/A"},
+        "favicons": ["N/A"],
+        "main_images": ["N/A"],
+        "canonical_url": "N/A",
+        "robots_meta": "N/A",
+        "internal_links_count": 0,
+        "external_links_count": 0,
+        "internal_links_sample": [],
+        "external_links_sample": [],
+        "last_modified": "N/A",
+        "content_length": "N/A",
+        "server": "N/A",
+        "load_time": 0,
+    }
+
+def create_session():
+    # c-ares resolver plus aiohttp's DNS cache: each host is resolved once per run.
+    # Idle keep-alive connections are pooled so repeat hits on a host skip the TCP/TLS handshake.
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        resolver=aiohttp.AsyncResolver(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=HEADERS,
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+    )
+
+async def fetch_worker(session, url_q, fetch_q, sem, cache):
+    while (url := await url_q.get()) is not None:
+        try:
+            html, status_code, response_headers, load_time = await fetch_async(session, url, sem, cache)
+        except Exception as e:
+            # One bad URL must not take the worker (and every URL queued behind it) down with it.
+            logging.error(f"[✗] Unexpected error while fetching {url}: {e!r}")
+            html, status_code, response_headers, load_time = None, 'N/A', {}, 0
+        await fetch_q.put((url, html, status_code, response_headers, load_time))
+
+class ParsePool:
+    """ProcessPoolExecutor that is replaced when one of its worker processes dies."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=PARSE_MP_CONTEXT)
+
+    async def run(self, fn, *args):
+        executor = self.executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A dead worker breaks the executor for good; every in-flight parse fails with it,
+            # and only the first of those swaps in a fresh pool.
+            if self.executor is executor:
+                logging.error("A parse worker process died, restarting the process pool")
+                executor.shutdown(wait=False)
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=PARSE_MP_CONTEXT
+                )
+            raise
+
+    def close(self):
+        self.executor.shutdown()
+
+async def parse_worker(fetch_q, parse_q, pool):
+    while (item := await fetch_q.get()) is not None:
+        url, html, status_code, response_headers, load_time = item
+        if not html:
+            scraped_data = failed_scrape_data()
+        else:
+            try:
+                # Parse in worker processes: the event loop stays free and parses run outside the GIL.
+                scraped_data = await pool.run(
+                    smart_scrape, html, url, response_headers, load_time, HEAD_ONLY
+                )
+            except BrokenProcessPool:
+                logging.error(f"[✗] Parse worker died while parsing {url}")
+                scraped_data = failed_scrape_data()
+            except Exception as e:
+                logging.error(f"[✗] Failed to parse {url}: {e!r}")
+                scraped_data = failed_scrape_data()
+        await parse_q.put((url, status_code, scraped_data))
+
+async def send_worker(session, parse_q, sem, limiter):
+    # Coalesce embeds into as few webhook messages as Discord's per-message limits allow;
+    # a partial batch is flushed once no new result has arrived for EMBED_BATCH_LINGER.
+    posts = set()
+    batch, batch_domains, batch_chars = [], [], 0
+
+    def flush():
+        nonlocal batch, batch_domains, batch_chars
+        if batch:
+            post = asyncio.create_task(post_embeds(
+                session, sem, limiter, DISCORD_WEBHOOK_URL, batch, batch_domains
+            ))
+            posts.add(post)
+            post.add_done_callback(posts.discard)
+        batch, batch_domains, batch_chars = [], [], 0
+
+    while True:
+        try:
+            item = await asyncio.wait_for(parse_q.get(), EMBED_BATCH_LINGER)
+        except asyncio.TimeoutError:
+            flush()
+            continue
+        if item is None:
+            break
+        url, status_code, scraped_data = item
+        domain = urlparse(url).netloc
+        try:
+            embed = build_embed(domain, scraped_data, url, status_code)
+        except Exception as e:
+            logging.error(f"[✗] Failed to build embed for {url}: {e!r}")
+            embed = build_embed(domain, failed_scrape_data(), url, status_code)
+        chars = embed_chars(embed)
+        if len(batch) == MAX_EMBEDS_PER_MESSAGE or batch_chars + chars > MAX_EMBED_CHARS_PER_MESSAGE:
+            flush()
+        batch.append(embed)
+        batch_domains.append(domain)
+        batch_chars += chars
+
+    flush()
+    await asyncio.gather(*posts)
+
+async def stop_workers(queue, workers):
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+@asynccontextmanager
+async def scrape_pipeline():
+    # Yields the URL queue of a running fetch -> parse -> send pipeline and drains it on exit.
+    url_q = asyncio.Queue()
+    fetch_q = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    parse_q = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    fetch_sem = asyncio.BoundedSemaphore(MAX_CONCURRENT_FETCHES)
+    webhook_sem = asyncio.Semaphore(MAX_CONCURRENT_WEBHOOKS)
+    webhook_limiter = TokenBucket(WEBHOOK_RATE, WEBHOOK_RATE_PERIOD)
+
+    with closing(ResponseCache(CACHE_PATH)) as cache, \
+            closing(ParsePool(PARSE_WORKERS)) as pool:
+        async with create_session() as session:
+            fetchers = [asyncio.create_task(fetch_worker(session, url_q, fetch_q, fetch_sem, cache))
+                        for _ in range(MAX_CONCURRENT_FETCHES)]
+            parsers = [asyncio.create_task(parse_worker(fetch_q, parse_q, pool))
+                       for _ in range(PARSE_WORKERS)]
+            senders = [asyncio.create_task(send_worker(session, parse_q, webhook_sem, webhook_limiter))]
+
+            try:
+                yield url_q
+            finally:
+                await stop_workers(url_q, fetchers)
+                await stop_workers(fetch_q, parsers)
+                await stop_workers(parse_q, senders)
+
+async def run(urls):
+    async with scrape_pipeline() as url_q:
+        for url in urls:
+            url_q.put_nowait(url)
+
+async def serve(host: str, port: int):
+    # Long-running mode: the session, DNS cache, keep-alive pool, response cache and parse
+    # processes stay warm while clients stream newline-separated URLs over a TCP socket.
+    async with scrape_pipeline() as url_q:
+        clients = {}
+
+        async def handle_client(reader, writer):
+            clients[writer] = asyncio.current_task()
+            try:
+                async for line in reader:
+                    url = line.decode(errors="replace").strip()
+                    if not url:
+                        continue
+                    if not is_valid_url(url):
+                        logging.warning(f"Invalid URL skipped: {url}")
+                        writer.write(f"invalid {url}\n".encode())
+                    else:
+                        logging.info(f"Starting scrape for: {url}")
+                        await url_q.put(url)
+                        writer.write(f"queued {url}\n".encode())
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                del clients[writer]
+                writer.close()
+
+        server = await asyncio.start_server(handle_client, host, port)
+        stop = asyncio.Event()
+        with suppress(NotImplementedError):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+
+        logging.info(f"Serving on {host}:{port}")
+        print(Fore.CYAN + f"[...] Waiting for URLs on {host}:{port}")
+        async with server:
+            await stop.wait()
+            # A connected client would otherwise keep its handler, and the shutdown, waiting forever.
+            server.close()
+            if hasattr(server, "close_clients"):  # Python 3.13+
+                server.close_clients()
+            else:
+                for writer in list(clients):
+                    writer.close()
+            await asyncio.gather(*clients.values())
+        logging.info("Shutting down, finishing queued URLs")
+
+def parse_address(value: str):
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
 def main():
+    parser = argparse.ArgumentParser(description="Scrape web pages and report them to a Discord webhook.")
+    parser.add_argument("urls", nargs="*", help="URLs to scrape (prompted for when omitted)")
+    parser.add_argument("--serve", metavar="[HOST:]PORT", type=parse_address,
+                        help="run as a daemon reading newline-separated URLs from a TCP socket")
+    args = parser.parse_args()
+
     banner()
 
-    import sys
-    if len(sys.argv) > 1:
-        urls = sys.argv[1:]
-    else:
-        urls = get_urls_from_input()
+    if args.serve:
+        asyncio.run(serve(*args.serve))
+        return
+
+    urls = args.urls or get_urls_from_input()
 
     if not urls:
         print(Fore.RED + "No URLs provided. Exiting.")
         return
 
+    valid_urls = []
     for url in urls:
         if not is_valid_url(url):
             logging.warning(f"Invalid URL skipped: {url}")
@@ -320,39 +912,9 @@ def main():
 
         logging.info(f"Starting scrape for: {url}")
         print(Fore.CYAN + f"[...] Scraping: {url}")
+        valid_urls.append(url)
 
-        html, status_code, response_headers, load_time = fetch_website_content(url)
-
-        if not html:
-            scraped_data = {
-                "title": "N/A",
-                "meta_description": "N/A",
-                "meta_keywords": "N/A",
-                "headlines": ["Failed to retrieve content."],
-                "subheadlines": ["Failed to retrieve content."],
-                "summaries": ["Failed to retrieve content."],
-                "charset": "N/A",
-                "lang": "N/A",
-                "json_ld": ["N/A"],
-                "open_graph": {"N/A": "N/A"},
-                "favicons": ["N/A"],
-                "main_images": ["N/A"],
-                "canonical_url": "N/A",
-                "robots_meta": "N/A",
-                "internal_links_count": 0,
-                "external_links_count": 0,
-                "internal_links_sample": [],
-                "external_links_sample": [],
-                "last_modified": "N/A",
-                "content_length": "N/A",
-                "server": "N/A",
-                "load_time": 0,
-            }
-        else:
-            scraped_data = smart_scrape(html, url, response_headers, load_time)
-
-        domain = urlparse(url).netloc
-        send_discord_embed(DISCORD_WEBHOOK_URL, domain, scraped_data, url, status_code)
+    asyncio.run(run(valid_urls))
 
 if __name__ == "__main__":
     main()
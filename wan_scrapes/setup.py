@@ -5,8 +5,12 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
-        "beautifulsoup4",
-        "requests",
+        "lxml",
+        "selectolax",
+        "aiohttp",
+        "aiodns",
+        "multidict",
+        "orjson",
         "python-dotenv",
         "pyfiglet",
         "colorama"